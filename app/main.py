@@ -1,57 +1,73 @@
-from fastapi import APIRouter
-from app.settings import settings
+from types import MappingProxyType
+import orjson
+from fastapi import APIRouter, Response
+from app.settings import settings_dict as S
 
 router = APIRouter()
 
+# Known providers and some common model options (static for the process lifetime)
+_MODEL_CATALOG = MappingProxyType({
+    "openai": (
+        "gpt-5", "gpt-5-mini", "gpt-5-nano",
+        "gpt-4.1", "gpt-4.1-mini", "gpt-4.1-nano",
+        "o3", "o4-mini",
+        "gpt-4o", "gpt-4o-mini",
+    ),
+    "anthropic": (
+        "claude-3-5-sonnet-latest",
+        "claude-3-5-haiku-latest",
+        "claude-3-opus-latest",
+    ),
+    "groq": (
+        "llama-3.1-70b-versatile",
+        "llama-3.1-8b-instant",
+    ),
+    "deepseek": (
+        "deepseek-chat",
+        "deepseek-reasoner",
+    ),
+})
+_AVAILABLE_PROVIDERS = tuple(_MODEL_CATALOG)
+# provider -> (model setting, API key setting)
+_PROVIDER_FIELDS = MappingProxyType({
+    "openai": ("OPENAI_MODEL", "OPENAI_API_KEY"),
+    "anthropic": ("ANTHROPIC_MODEL", "ANTHROPIC_API_KEY"),
+    "groq": ("GROQ_MODEL", "GROQ_API_KEY"),
+    "deepseek": ("DEEPSEEK_MODEL", "DEEPSEEK_API_KEY"),
+})
+_STORES = MappingProxyType({"bots": "json-or-supabase", "chats": "json", "kb": "json", "files": "fs"})
 
-@router.get("/health")
-def health():
-    provider = (settings.MODEL_PROVIDER or "").lower()
+
+def _health_payload() -> dict:
+    provider = (S["MODEL_PROVIDER"] or "").lower()
     model = None
     has_key = False
 
-    # Known providers and some common model options
-    available_providers = ["openai", "anthropic", "groq"]
-    model_catalog = {
-        "openai": [
-            "gpt-5", "gpt-5-mini", "gpt-5-nano",
-            "gpt-4.1", "gpt-4.1-mini", "gpt-4.1-nano",
-            "o3", "o4-mini",
-            "gpt-4o", "gpt-4o-mini",
-        ],
-        "anthropic": [
-            "claude-3-5-sonnet-latest",
-            "claude-3-5-haiku-latest",
-            "claude-3-opus-latest",
-        ],
-        "groq": [
-            "llama-3.1-70b-versatile",
-            "llama-3.1-8b-instant",
-        ],
-    }
-
-    if provider == "openai":
-        model = settings.OPENAI_MODEL
-        has_key = bool(settings.OPENAI_API_KEY)
-    elif provider == "anthropic":
-        model = settings.ANTHROPIC_MODEL
-        has_key = bool(settings.ANTHROPIC_API_KEY)
-    elif provider == "groq":
-        model = settings.GROQ_MODEL
-        has_key = bool(settings.GROQ_API_KEY)
+    fields = _PROVIDER_FIELDS.get(provider)
+    if fields:
+        model = S[fields[0]]
+        has_key = bool(S[fields[1]])
 
     return {
         "ok": True,
         "provider": provider,
         "model": model,
         "api_key_set": has_key,
-        "temperature": settings.TEMPERATURE,
-        "max_tokens": settings.MAX_TOKENS,
-        "available_providers": available_providers,
-        "available_models": model_catalog.get(provider, model_catalog["openai"]),
-        "models_by_provider": model_catalog,
+        "temperature": S["TEMPERATURE"],
+        "max_tokens": S["MAX_TOKENS"],
+        "available_providers": _AVAILABLE_PROVIDERS,
+        "available_models": _MODEL_CATALOG.get(provider, _MODEL_CATALOG["openai"]),
+        "models_by_provider": _MODEL_CATALOG,
         "ws": True,
         "sse": True,
-        "stores": {"bots": "json-or-supabase", "chats": "json", "kb": "json", "files": "fs"},
+        "stores": _STORES,
     }
 
+
+# Every input above is fixed for the process lifetime, so the body is serialized once
+_HEALTH_BODY = orjson.dumps(_health_payload(), default=dict)
+
+
+@router.get("/health")
+def health():
+    return Response(content=_HEALTH_BODY, media_type="application/json")
@@ -1,3 +1,4 @@
+from types import MappingProxyType
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,11 +11,19 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = Field(default="gpt-4o-mini")
     ANTHROPIC_MODEL: str = Field(default="claude-3-5-sonnet-latest")
     GROQ_MODEL: str = Field(default="llama-3.1-70b-versatile")
+    DEEPSEEK_MODEL: str = Field(default="deepseek-chat")
+
+    # Generation defaults
+    TEMPERATURE: float = Field(default=0.2)
+    MAX_TOKENS: int = Field(default=800)
+    REQUEST_TIMEOUT_S: float = Field(default=60.0)
 
     # API keys (optional depending on provider you use)
     OPENAI_API_KEY: str | None = None
     ANTHROPIC_API_KEY: str | None = None
     GROQ_API_KEY: str | None = None
+    DEEPSEEK_API_KEY: str | None = None
+    DEEPSEEK_BASE_URL: str = Field(default="https://api.deepseek.com")
 
     # Tools & data
     TAVILY_API_KEY: str | None = None
@@ -30,3 +39,5 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
+# Read-only snapshot for hot paths; settings are env-driven and fixed for the process lifetime
+settings_dict = MappingProxyType(settings.model_dump())
@@ -1,7 +1,81 @@
-from typing import Dict, Any, Optional
-from app.settings import settings
+from typing import Dict, Any, Mapping
+from types import MappingProxyType
+from app.settings import settings_dict as S
+import atexit
+import concurrent.futures
+import functools
+import importlib
+import importlib.util
+import itertools
+import re
 import threading
 import asyncio
+import httpx
+
+
+class _LazyImport:
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._mod = None
+
+    def __getattr__(self, attr: str):
+        if self._mod is None:
+            self._mod = importlib.import_module(self._name)
+        return getattr(self._mod, attr)
+
+
+# Provider SDKs are only materialized for providers that are actually used
+_openai = _LazyImport("openai")
+_anthropic = _LazyImport("anthropic")
+_groq = _LazyImport("groq")
+
+# One pooled transport per (provider, sync/async) so connections and TLS sessions
+# are reused across calls; HTTP/2 is enabled when the optional h2 package is present.
+# Matches the pool the SDKs build for themselves (1000 connections, 100 keep-alive) so
+# sharing it never lowers the concurrency ceiling; idle connections stay warm for 30s.
+_HTTPX_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=30.0)
+_HTTPX_HTTP2 = importlib.util.find_spec("h2") is not None
+_HTTPX_CLIENTS: dict[tuple[str, bool], httpx.Client | httpx.AsyncClient] = {}
+
+
+def _http_client(provider: str, want_async: bool = False):
+    key = (provider, want_async)
+    client = _HTTPX_CLIENTS.get(key)
+    if client is None:
+        cls = httpx.AsyncClient if want_async else httpx.Client
+        # follow_redirects mirrors the SDKs' own DefaultHttpxClient so sharing the pool keeps request behaviour
+        client = _HTTPX_CLIENTS.setdefault(key, cls(http2=_HTTPX_HTTP2, limits=_HTTPX_LIMITS, follow_redirects=True))
+    return client
+
+
+@atexit.register
+def _close_http_clients():
+    for client in _HTTPX_CLIENTS.values():
+        if isinstance(client, httpx.Client):
+            try:
+                client.close()
+            except Exception:
+                pass
+
+
+async def aclose_http_clients() -> None:
+    """Close the async transports and drop the SDK clients bound to them.
+
+    Async pools belong to the event loop that first used them, so they are shut
+    down with that loop and rebuilt lazily on the next one.
+    """
+    for key in [k for k in _HTTPX_CLIENTS if k[1]]:
+        client = _HTTPX_CLIENTS.pop(key)
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+    with _CLIENTS_LOCK:
+        for key in [k for k in _CLIENTS if k[1]]:
+            del _CLIENTS[key]
+
 
 SYSTEM_PROMPT = """
 You are Quantum Commander - an interactive AI pair-programmer and ops assistant. Be concise, actionable, and safe.
@@ -28,33 +102,109 @@ Usage guidance:
 - For custom logic: include EXT_INSTALL:<module>.py, then one fenced code block of the module, then EXT_CALL:<module>:<func> with args.
 - After listing directives, end with: Say "proceed" to run.
 - If the user asks to "run" without details, ask clarifying questions first; once confirmed, output directives.
-"""
+""".strip()
+
 
+# Shared default system message (a plain dict so SDK JSON encoders accept it; never mutated)
+_SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
 
-def _lazy_client(provider_override: str | None = None, timeout_s: float | None = None):
-    provider = (provider_override or settings.MODEL_PROVIDER).lower()
-    timeout = timeout_s if timeout_s is not None else settings.REQUEST_TIMEOUT_S
+
+def _chat_messages(sys_prompt: str, user_prompt: str) -> list[dict]:
+    """System + user message list shared by the chat-completions style calls."""
+    sys_msg = _SYSTEM_MSG if sys_prompt is SYSTEM_PROMPT else {"role": "system", "content": sys_prompt}
+    return [sys_msg, {"role": "user", "content": user_prompt}]
+
+
+def _build_chat_kwargs(model: str, sys_prompt: str, user_prompt: str, temperature: float,
+                       max_tokens: int, stream: bool = False) -> dict:
+    """OpenAI Chat Completions kwargs; tokens/temperature only for chat-compatible models."""
+    kwargs = {"model": model, "messages": _chat_messages(sys_prompt, user_prompt)}
+    if stream:
+        kwargs["stream"] = True
+    if not _openai_use_responses(model):
+        kwargs.update(_openai_tokens_kw(model, max_tokens))
+        kwargs["temperature"] = temperature
+    return kwargs
+
+
+# Constructed SDK clients, keyed by (provider, async). Per-call timeouts come from
+# client input, so they are applied with with_options() rather than keyed on.
+_CLIENTS: dict[tuple[str, bool], tuple[str, Any]] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _build_client(provider: str, want_async: bool):
+    timeout = float(S["REQUEST_TIMEOUT_S"])
     if provider == "openai":
-        from openai import OpenAI
-        return "openai", OpenAI(api_key=settings.OPENAI_API_KEY, timeout=timeout)
+        cls = _openai.AsyncOpenAI if want_async else _openai.OpenAI
+        return "openai", cls(api_key=S["OPENAI_API_KEY"], timeout=timeout,
+                             http_client=_http_client(provider, want_async))
     if provider == "anthropic":
-        import anthropic
-        return "anthropic", anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY, timeout=timeout)
+        cls = _anthropic.AsyncAnthropic if want_async else _anthropic.Anthropic
+        return "anthropic", cls(api_key=S["ANTHROPIC_API_KEY"], timeout=timeout,
+                                http_client=_http_client(provider, want_async))
     if provider == "groq":
-        from groq import Groq
-        return "groq", Groq(api_key=settings.GROQ_API_KEY, timeout=timeout)
+        cls = _groq.AsyncGroq if want_async else _groq.Groq
+        return "groq", cls(api_key=S["GROQ_API_KEY"], timeout=timeout,
+                           http_client=_http_client(provider, want_async))
     if provider == "deepseek":
         # DeepSeek supports an OpenAI-compatible API; use the OpenAI client with a custom base_url
-        from openai import OpenAI
-        base_url = getattr(settings, "DEEPSEEK_BASE_URL", "https://api.deepseek.com")
-        return "openai", OpenAI(api_key=settings.DEEPSEEK_API_KEY, base_url=base_url, timeout=timeout)
+        base_url = S.get("DEEPSEEK_BASE_URL") or "https://api.deepseek.com"
+        cls = _openai.AsyncOpenAI if want_async else _openai.OpenAI
+        return "openai", cls(api_key=S["DEEPSEEK_API_KEY"], base_url=base_url, timeout=timeout,
+                             http_client=_http_client(provider, want_async))
     raise ValueError(f"Unsupported MODEL_PROVIDER: {provider}")
 
 
+def _lazy_client(provider_override: str | None = None, timeout_s: float | None = None, want_async: bool = False):
+    provider = (provider_override or S["MODEL_PROVIDER"]).lower()
+    key = (provider, want_async)
+    hit = _CLIENTS.get(key)
+    if hit is None:
+        with _CLIENTS_LOCK:
+            hit = _CLIENTS.get(key)
+            if hit is None:
+                hit = _CLIENTS[key] = _build_client(provider, want_async)
+    if timeout_s is not None and float(timeout_s) != float(S["REQUEST_TIMEOUT_S"]):
+        # Shallow copy that shares the pooled transport
+        return hit[0], hit[1].with_options(timeout=float(timeout_s))
+    return hit
+
+
+def _lazy_async_client(provider_override: str | None = None, timeout_s: float | None = None):
+    """Async twin of _lazy_client for the streaming path."""
+    return _lazy_client(provider_override=provider_override, timeout_s=timeout_s, want_async=True)
+
+
+# Long-lived event loops (one per daemon thread) that serve run_once calls.
+_SYNC_LOOPS: list[asyncio.AbstractEventLoop] = []
+_SYNC_LOOPS_LOCK = threading.Lock()
+_SYNC_LOOPS_SIZE = 4
+_sync_loop_rr = itertools.count()
+
+
+def _sync_loop(avoid: asyncio.AbstractEventLoop | None = None) -> asyncio.AbstractEventLoop:
+    if len(_SYNC_LOOPS) < _SYNC_LOOPS_SIZE:
+        with _SYNC_LOOPS_LOCK:
+            while len(_SYNC_LOOPS) < _SYNC_LOOPS_SIZE:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name=f"agent-sync-{len(_SYNC_LOOPS)}",
+                    daemon=True,
+                ).start()
+                _SYNC_LOOPS.append(loop)
+    loop = _SYNC_LOOPS[next(_sync_loop_rr) % _SYNC_LOOPS_SIZE]
+    if loop is avoid:
+        # Never hand a call back to the loop that is blocked waiting on it
+        loop = _SYNC_LOOPS[(_SYNC_LOOPS.index(loop) + 1) % _SYNC_LOOPS_SIZE]
+    return loop
+
+
 def run_once(*, provider: str, model: str, message: str, temperature: float, max_tokens: int) -> str:
     """Synchronous helper to invoke make_agent from non-async contexts.
-    It safely creates a new event loop when needed, or runs in a background thread
-    if already inside an active loop.
+    The call always runs on one of the persistent background loops, so it works
+    the same with or without an active loop in the calling thread.
     """
     meta: Dict[str, Any] = {
         "provider": provider,
@@ -62,48 +212,55 @@ def run_once(*, provider: str, model: str, message: str, temperature: float, max
         "temperature": temperature,
         "max_tokens": max_tokens,
     }
-
-    async def _call():
-        return await make_agent(message, meta)
-
     try:
-        # Prefer running directly when no loop is active in this thread
-        return asyncio.run(_call())
+        running = asyncio.get_running_loop()
     except RuntimeError:
-        # If there's already a running loop, execute in a background thread
-        result_holder: Dict[str, Any] = {}
+        running = None
+    fut = asyncio.run_coroutine_threadsafe(make_agent(message, meta), _sync_loop(avoid=running))
+    # The SDK enforces REQUEST_TIMEOUT_S per request; allow a little slack on top
+    timeout = float(S["REQUEST_TIMEOUT_S"]) + 5.0
+    try:
+        return fut.result(timeout=timeout) or ""
+    except concurrent.futures.TimeoutError:
+        fut.cancel()
+        return f"[agent-error] TimeoutError: no response within {timeout:.0f}s"
+
 
-        def _runner():
-            result_holder["result"] = asyncio.run(_call())
+_MODEL_FIELDS = {
+    "openai": "OPENAI_MODEL",
+    "anthropic": "ANTHROPIC_MODEL",
+    "groq": "GROQ_MODEL",
+    "deepseek": "DEEPSEEK_MODEL",
+}
 
-        t = threading.Thread(target=_runner, daemon=True)
-        t.start()
-        t.join()
-        return result_holder.get("result", "")
+# Newer models (gpt-5 family, o1/o3/o4 reasoning family, gpt-4o/4.1) use the Responses API / max_completion_tokens
+_OPENAI_NEW_PREFIXES = ("gpt-5", "gpt-4o", "gpt-4.1")
+_OPENAI_O_FAMILY = re.compile(r"^o[134](?:$|[-_.])")
 
 
 def _model_name(provider: str, model_override: str | None = None) -> str:
     if model_override:
         return model_override
-    return {
-        "openai": settings.OPENAI_MODEL,
-        "anthropic": settings.ANTHROPIC_MODEL,
-        "groq":   settings.GROQ_MODEL,
-        "deepseek": settings.DEEPSEEK_MODEL,
-    }[provider]
+    return S[_MODEL_FIELDS[provider]]
 
 
-def _openai_tokens_kw(model: str, max_tokens: int) -> dict:
+@functools.lru_cache(maxsize=64)
+def _openai_is_new_model(model: str) -> bool:
+    """True for the newer OpenAI families, which take the Responses API and max_completion_tokens."""
     m = (model or "").lower()
-    # Newer models (gpt-5 family, o* family, gpt-4o/4.1) expect max_completion_tokens (when using Chat Completions)
-    if m.startswith("gpt-5") or m.startswith("o") or m.startswith("gpt-4o") or m.startswith("gpt-4.1"):
-        return {"max_completion_tokens": max_tokens}
-    return {"max_tokens": max_tokens}
+    return m.startswith(_OPENAI_NEW_PREFIXES) or _OPENAI_O_FAMILY.match(m) is not None
+
+
+@functools.lru_cache(maxsize=64)
+def _openai_tokens_kw(model: str, max_tokens: int) -> Mapping[str, int]:
+    # Newer models expect max_completion_tokens (when using Chat Completions)
+    if _openai_is_new_model(model):
+        return MappingProxyType({"max_completion_tokens": max_tokens})
+    return MappingProxyType({"max_tokens": max_tokens})
 
 
 def _openai_use_responses(model: str) -> bool:
-    m = (model or "").lower()
-    return m.startswith("gpt-5") or m.startswith("o") or m.startswith("gpt-4o") or m.startswith("gpt-4.1")
+    return _openai_is_new_model(model)
 
 
 def _openai_has_responses(client) -> bool:
@@ -136,12 +293,30 @@ def _openai_resp_text(resp) -> str:
     return ""
 
 
+async def prewarm_clients(providers) -> None:
+    """Open a pooled connection to each provider with a configured API key.
+
+    Issues one cheap HEAD against the SDK's base URL so the TLS handshake is
+    paid at startup rather than on the first user message.
+    """
+    for p in dict.fromkeys((p or "").lower() for p in providers):
+        if p not in _MODEL_FIELDS or not S.get(f"{p.upper()}_API_KEY"):
+            continue
+        try:
+            _, client = _lazy_async_client(p)
+            await _http_client(p, True).head(str(client.base_url))
+        except Exception:
+            pass
+
+
 async def make_agent(message: str, meta: Dict[str, Any] | None = None) -> str:
     meta = meta or {}
     provider_override = meta.get("provider")
     model_override = meta.get("model")
-    temperature = float(meta.get("temperature", settings.TEMPERATURE))
-    max_tokens = int(meta.get("max_tokens", settings.MAX_TOKENS))
+    temperature = meta.get("temperature")
+    temperature = float(S["TEMPERATURE"] if temperature is None else temperature)
+    max_tokens = meta.get("max_tokens")
+    max_tokens = int(S["MAX_TOKENS"] if max_tokens is None else max_tokens)
     timeout_s = meta.get("timeout_s")
 
     provider, client = _lazy_client(provider_override=provider_override, timeout_s=timeout_s)
@@ -149,7 +324,8 @@ async def make_agent(message: str, meta: Dict[str, Any] | None = None) -> str:
     user_prompt = message
     sys_prompt = (meta.get("system_prompt") or SYSTEM_PROMPT)
 
-    try:
+    def _complete() -> str:
+        # The sync SDK clients block; run them off the event loop so other sockets keep flowing
         if provider == "openai":
             if _openai_has_responses(client):
                 # Prefer the newer Responses API when available (works across modern models)
@@ -160,18 +336,9 @@ async def make_agent(message: str, meta: Dict[str, Any] | None = None) -> str:
                 )
                 return _openai_resp_text(resp).strip()
             # Otherwise fall back to Chat Completions for broad compatibility
-            kwargs = {
-                "model": model,
-                "messages": [
-                    {"role": "system", "content": sys_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-            }
-            # Supply temperature/tokens only for legacy/chat-compatible models
-            if not _openai_use_responses(model):
-                kwargs.update(_openai_tokens_kw(model, max_tokens))
-                kwargs["temperature"] = temperature
-            resp = client.chat.completions.create(**kwargs)
+            resp = client.chat.completions.create(
+                **_build_chat_kwargs(model, sys_prompt, user_prompt, temperature, max_tokens)
+            )
             return (resp.choices[0].message.content or "").strip()
 
         if provider == "anthropic":
@@ -187,15 +354,14 @@ async def make_agent(message: str, meta: Dict[str, Any] | None = None) -> str:
         if provider == "groq":
             resp = client.chat.completions.create(
                 model=model,
-                messages=[
-                    {"role": "system", "content": sys_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
+                messages=_chat_messages(sys_prompt, user_prompt),
                 temperature=temperature,
                 max_tokens=max_tokens,
             )
             return (resp.choices[0].message.content or "").strip()
 
+    try:
+        return await asyncio.to_thread(_complete)
     except Exception as e:
         # Graceful fallback: no stack traces to clients
         return f"[agent-error] {type(e).__name__}: {e}"
@@ -206,164 +372,120 @@ async def stream_agent(message: str, meta: Dict[str, Any] | None = None):
     meta = meta or {}
     provider_override = meta.get("provider")
     model_override = meta.get("model")
-    temperature = float(meta.get("temperature", settings.TEMPERATURE))
-    max_tokens = int(meta.get("max_tokens", settings.MAX_TOKENS))
+    temperature = meta.get("temperature")
+    temperature = float(S["TEMPERATURE"] if temperature is None else temperature)
+    max_tokens = meta.get("max_tokens")
+    max_tokens = int(S["MAX_TOKENS"] if max_tokens is None else max_tokens)
     timeout_s = meta.get("timeout_s")
 
-    provider, client = _lazy_client(provider_override=provider_override, timeout_s=timeout_s)
+    provider, client = _lazy_async_client(provider_override=provider_override, timeout_s=timeout_s)
     model = _model_name(provider, model_override=model_override)
     user_prompt = message
     sys_prompt = (meta.get("system_prompt") or SYSTEM_PROMPT)
 
-    queue: asyncio.Queue[Optional[str]] = asyncio.Queue()
-    loop = asyncio.get_running_loop()
-
-    def run_stream():
-        try:
-            if provider == "openai":
-                if _openai_has_responses(client):
-                    # Streaming with the Responses API (preferred)
-                    with client.responses.stream(
-                        model=model,
-                        instructions=sys_prompt,
-                        input=user_prompt,
-                    ) as stream:
-                        for event in stream:
-                            try:
-                                if getattr(event, "type", "") == "response.output_text.delta":
-                                    delta = getattr(event, "delta", "") or ""
-                                    if delta:
-                                        loop.call_soon_threadsafe(queue.put_nowait, delta)
-                                elif getattr(event, "type", "") == "response.error":
-                                    err = getattr(getattr(event, "error", None), "message", "")
-                                    if err:
-                                        loop.call_soon_threadsafe(queue.put_nowait, f"[agent-error] {err}")
-                            except Exception:
-                                pass
-                elif _openai_use_responses(model) and not _openai_has_responses(client):
-                    # Compatibility fallback: Responses API unavailable in client version.
-                    # Perform a non-streaming request and yield the whole text once.
-                    try:
-                        text = make_agent.__wrapped__(message=user_prompt, meta={
-                            "provider": "openai",
-                            "model": model,
-                            "temperature": temperature,
-                            "max_tokens": max_tokens,
-                            "system_prompt": sys_prompt,
-                        }) if hasattr(make_agent, "__wrapped__") else None
-                    except Exception:
-                        text = None
-                    if not text:
-                        try:
-                            # Final fallback: minimal Chat Completions without extra params
-                            resp = client.chat.completions.create(
-                                model=model,
-                                messages=[
-                                    {"role": "system", "content": sys_prompt},
-                                    {"role": "user", "content": user_prompt},
-                                ],
-                                stream=False,
-                            )
-                            text = (resp.choices[0].message.content or "")
-                        except Exception as e:
-                            loop.call_soon_threadsafe(queue.put_nowait, f"[agent-error] {type(e).__name__}: {e}")
-                            text = None
-                    if text:
-                        loop.call_soon_threadsafe(queue.put_nowait, text)
-                else:
-                    # Streaming via Chat Completions. For models that dislike max_tokens,
-                    # omit it and rely on provider defaults.
-                    kwargs = {
-                        "model": model,
-                        "messages": [
-                            {"role": "system", "content": sys_prompt},
-                            {"role": "user", "content": user_prompt},
-                        ],
-                        "stream": True,
-                    }
-                    # For chat-compatible models we can send tokens/temperature; for newer models, omit
-                    if not _openai_use_responses(model):
-                        kwargs.update(_openai_tokens_kw(model, max_tokens))
-                        kwargs["temperature"] = temperature
-                    resp = client.chat.completions.create(**kwargs)
-                    for chunk in resp:
-                        try:
-                            delta = chunk.choices[0].delta.content or ""
-                        except Exception:
-                            delta = ""
-                        if delta:
-                            loop.call_soon_threadsafe(queue.put_nowait, delta)
-            elif provider == "groq":
-                resp = client.chat.completions.create(
+    try:
+        if provider == "openai":
+            if _openai_has_responses(client):
+                # Streaming with the Responses API (preferred)
+                async with client.responses.stream(
                     model=model,
-                    messages=[
-                        {"role": "system", "content": sys_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    stream=True,
+                    instructions=sys_prompt,
+                    input=user_prompt,
+                ) as stream:
+                    async for event in stream:
+                        etype = getattr(event, "type", "")
+                        if etype == "response.output_text.delta":
+                            delta = getattr(event, "delta", "") or ""
+                            if delta:
+                                yield delta
+                        elif etype == "response.error":
+                            err = getattr(getattr(event, "error", None), "message", "")
+                            if err:
+                                yield f"[agent-error] {err}"
+            elif _openai_use_responses(model):
+                # Compatibility fallback: Responses API unavailable in client version.
+                # Perform a minimal non-streaming Chat Completions request and yield the whole text once.
+                resp = await client.chat.completions.create(
+                    model=model,
+                    messages=_chat_messages(sys_prompt, user_prompt),
+                    stream=False,
+                )
+                text = (resp.choices[0].message.content or "")
+                if text:
+                    yield text
+            else:
+                # Streaming via Chat Completions with tokens/temperature for chat-compatible models
+                resp = await client.chat.completions.create(
+                    **_build_chat_kwargs(model, sys_prompt, user_prompt, temperature, max_tokens, stream=True)
                 )
-                for chunk in resp:
+                async for chunk in resp:
                     try:
                         delta = chunk.choices[0].delta.content or ""
                     except Exception:
                         delta = ""
                     if delta:
-                        loop.call_soon_threadsafe(queue.put_nowait, delta)
-            elif provider == "anthropic":
-                with client.messages.stream(
-                    model=model,
-                    system=sys_prompt,
-                    messages=[{"role": "user", "content": user_prompt}],
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                ) as stream:
-                    for event in stream:
-                        try:
-                            if getattr(event, "type", "") == "content_block_delta":
-                                delta = getattr(getattr(event, "delta", None), "text", "")
-                                if delta:
-                                    loop.call_soon_threadsafe(queue.put_nowait, delta)
-                        except Exception:
-                            pass
-        except Exception as e:
-            loop.call_soon_threadsafe(queue.put_nowait, f"[agent-error] {type(e).__name__}: {e}")
-        finally:
-            loop.call_soon_threadsafe(queue.put_nowait, None)
-
-    threading.Thread(target=run_stream, daemon=True).start()
-
-    while True:
-        chunk = await queue.get()
-        if chunk is None:
-            break
-        yield chunk
+                        yield delta
+        elif provider == "groq":
+            resp = await client.chat.completions.create(
+                model=model,
+                messages=_chat_messages(sys_prompt, user_prompt),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+            )
+            async for chunk in resp:
+                try:
+                    delta = chunk.choices[0].delta.content or ""
+                except Exception:
+                    delta = ""
+                if delta:
+                    yield delta
+        elif provider == "anthropic":
+            async with client.messages.stream(
+                model=model,
+                system=sys_prompt,
+                messages=[{"role": "user", "content": user_prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+            ) as stream:
+                async for delta in stream.text_stream:
+                    if delta:
+                        yield delta
+    except Exception as e:
+        yield f"[agent-error] {type(e).__name__}: {e}"
 
 # --- Bot overrides (JSON DB) ---
-from pathlib import Path as _P
-import json as _json
+import os as _os
+from commander.json_store import JsonStoreCache, by_id as _by_id
+
+# (QC_BOTS_DB path, store) in use; the store is replaced if the env var points elsewhere
+_BOTS_STORE: tuple[str, JsonStoreCache] | None = None
 
-def _bots_db():
-    path = _P("data/bots.json")
-    if not path.exists(): return []
-    try: return _json.loads(path.read_text("utf-8"))
-    except Exception: return []
+def _bots_db() -> dict:
+    global _BOTS_STORE
+    path = _os.environ.get("QC_BOTS_DB", "data/bots.json")
+    cached = _BOTS_STORE
+    if cached is None or cached[0] != path:
+        cached = _BOTS_STORE = (path, JsonStoreCache(path, index=_by_id))
+    return cached[1].load()[1]
 
 def apply_bot_overrides(payload: dict) -> dict:
     bot_id = (payload or {}).get("bot_id") or ""
     if not bot_id: return payload
-    for b in _bots_db():
-        if b.get("id") == bot_id:
-            # Inject model/provider/params if not explicitly set by client
-            payload.setdefault("provider", b.get("provider","openai"))
-            payload.setdefault("model", b.get("model","gpt-5"))
-            payload.setdefault("temperature", b.get("temperature",0.2))
-            payload.setdefault("max_tokens", b.get("max_tokens",800))
-            # Provide system prompt natively instead of mutating message
-            sp = (b.get("system_prompt") or "").strip()
-            if sp and not payload.get("system_prompt"):
-                payload["system_prompt"] = sp
-            break
+    b = _bots_db().get(bot_id)
+    if b is not None:
+        # Inject model/provider/params if not explicitly set by client
+        payload.setdefault("provider", b.get("provider","openai"))
+        payload.setdefault("model", b.get("model","gpt-5"))
+        payload.setdefault("temperature", b.get("temperature",0.2))
+        payload.setdefault("max_tokens", b.get("max_tokens",800))
+        # Provide system prompt natively instead of mutating message
+        sp = (b.get("system_prompt") or "").strip()
+        if sp and not payload.get("system_prompt"):
+            payload["system_prompt"] = sp
     return payload
 
+def configured_providers() -> list[str]:
+    """Providers in use: the configured default plus any referenced by a stored bot."""
+    providers = [S["MODEL_PROVIDER"]] + [b.get("provider") for b in _bots_db().values()]
+    return list(dict.fromkeys(p.lower() for p in providers if p and isinstance(p, str)))
@@ -1,22 +1,60 @@
 # ----- FastAPI Web (Vanilla WebSocket with raw text) -----
 import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pathlib
 import logging
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
+from contextlib import aclosing, asynccontextmanager
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-import json
+import orjson
+
+# repo-root-based paths
+repo_root = pathlib.Path(__file__).resolve().parent.parent
+# Load .env from repo root if present. This runs before the routers import
+# commander.agent, whose settings snapshot must already see these keys.
+_env_file = repo_root / ".env"
+if _env_file.is_file():
+    try:
+        load_dotenv(dotenv_path=str(_env_file), override=False)
+    except Exception:
+        pass
+
 from commander.routes_bots import router as bots_router
 from commander.routes_sse import router as sse_router
 from commander.routes_files import router as files_router
 from commander.routes_kb import router as kb_router
 from commander.routes_chats import router as chats_router
 
-app = FastAPI(title="Quantum Commander")
+# One-shot replies run the sync SDK call via asyncio.to_thread; each worker mostly
+# waits on the network, so allow more than the default min(32, cpu + 4).
+_AGENT_THREADS = int(os.environ.get("QC_AGENT_THREADS", "64"))
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    executor = ThreadPoolExecutor(max_workers=_AGENT_THREADS, thread_name_prefix="qc-agent")
+    asyncio.get_running_loop().set_default_executor(executor)
+    async def _prewarm():
+        # Best-effort: a malformed bots.json must not abort startup, so resolve providers in the task too
+        try:
+            await prewarm_clients(configured_providers())
+        except Exception:
+            log.debug("prewarm skipped", exc_info=True)
+
+    # Prime provider connections in the background so startup is never delayed
+    prewarm = asyncio.create_task(_prewarm())
+    try:
+        yield
+    finally:
+        if not prewarm.done():
+            prewarm.cancel()
+        await aclose_http_clients()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+app = FastAPI(title="Quantum Commander", lifespan=_lifespan)
 # Restrictive CORS: allow only same-origin localhost access
 app.add_middleware(
     CORSMiddleware,
@@ -35,19 +73,23 @@ log = logging.getLogger("qc")
 if not log.handlers:
     logging.basicConfig(level=os.environ.get("QC_LOG_LEVEL", "INFO"))
 
-# repo-root-based paths
-repo_root = pathlib.Path(__file__).resolve().parent.parent
-# Load .env from repo root if present
-try:
-    load_dotenv(dotenv_path=str(repo_root / ".env"), override=False)
-except Exception:
-    pass
 static_dir = repo_root / "static"
 static_dir.mkdir(parents=True, exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
 templates_dir = repo_root / "templates"
-templates = Jinja2Templates(directory=str(templates_dir))
+# index.html is static markup; cache its bytes per mtime instead of re-rendering it through Jinja on every GET
+_INDEX_CACHE: tuple[tuple[int, int], bytes] | None = None
+
+def _index_html() -> bytes:
+    global _INDEX_CACHE
+    path = templates_dir / "index.html"
+    st = path.stat()
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _INDEX_CACHE
+    if cached is None or cached[0] != sig:
+        cached = _INDEX_CACHE = (sig, path.read_bytes())
+    return cached[1]
 
 # Include app.* routers (e.g., /health)
 try:
@@ -58,7 +100,8 @@ except Exception:
 
 # Try to import the async make_agent(message) -> str; otherwise provide an async echo fallback.
 try:
-    from .agent import make_agent as call_agent, stream_agent, apply_bot_overrides  # type: ignore
+    from .agent import make_agent as call_agent, stream_agent, apply_bot_overrides, prewarm_clients, aclose_http_clients  # type: ignore
+    from .agent import configured_providers  # type: ignore
 except Exception:
     async def call_agent(message: str, meta=None) -> str:
         return f"Echo: {message}"
@@ -66,10 +109,82 @@ except Exception:
         yield f"Echo: {message}"
     def apply_bot_overrides(payload: dict):
         return payload
+    async def prewarm_clients(providers) -> None:
+        return None
+    async def aclose_http_clients() -> None:
+        return None
+    def configured_providers() -> list[str]:
+        return []
+
+# Streaming deltas are coalesced into frames of at least this many chars, or
+# whatever arrived within the delay window, to cut per-token frame overhead.
+_FLUSH_CHARS = 64
+_FLUSH_DELAY_S = 0.025
+
+async def _coalesced(deltas, max_chars: int = _FLUSH_CHARS, max_delay: float = _FLUSH_DELAY_S):
+    """Re-chunk an async stream of text deltas into fewer, larger pieces.
+
+    The first delta is passed through immediately so time-to-first-token is
+    unchanged; later ones are batched for at most max_delay.
+    """
+    buf: list[str] = []
+    size = 0
+    done = False
+    ready = asyncio.Event()
+
+    async def drain():
+        nonlocal size, done
+        try:
+            async for delta in deltas:
+                if delta:
+                    buf.append(delta)
+                    size += len(delta)
+                    ready.set()
+        finally:
+            done = True
+            ready.set()
+
+    task = asyncio.create_task(drain())
+    first = True
+    try:
+        while True:
+            await ready.wait()
+            if not (first or done or size >= max_chars):
+                # Give the producer a short window to add more text before flushing
+                await asyncio.sleep(max_delay)
+            ready.clear()
+            if buf:
+                out = "".join(buf)
+                buf.clear()
+                size = 0
+                first = False
+                yield out
+            if done and not buf:
+                await task  # surface producer errors
+                break
+    finally:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+async def _send(websocket: WebSocket, obj) -> None:
+    # orjson encodes in C; frames stay text so existing clients can JSON.parse them
+    await websocket.send_text(orjson.dumps(obj).decode())
+
+async def _receive(websocket: WebSocket) -> str | bytes:
+    # Accept text and binary frames; orjson parses either without an extra decode pass
+    msg = await websocket.receive()
+    if msg["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(msg.get("code", 1000))
+    text = msg.get("text")
+    return text if text is not None else (msg.get("bytes") or b"")
 
 @app.get("/", response_class=HTMLResponse)
-async def web_ui(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+async def web_ui():
+    return Response(content=_index_html(), media_type="text/html")
 
 @app.websocket("/ws")
 async def ws(websocket: WebSocket):
@@ -79,9 +194,9 @@ async def ws(websocket: WebSocket):
             # Receive message (JSON or plain text)
             is_json = False
             try:
-                raw = await websocket.receive_text()
+                raw = await _receive(websocket)
                 try:
-                    data = json.loads(raw)
+                    data = orjson.loads(raw)
                     # Apply bot overrides if available (provider/model/params/system prompt)
                     try:
                         data = apply_bot_overrides(data)  # type: ignore
@@ -90,11 +205,13 @@ async def ws(websocket: WebSocket):
                     message = data.get("message", "")
                     is_json = True
                 except Exception:
-                    message = raw
+                    message = raw if isinstance(raw, str) else raw.decode("utf-8", "replace")
+            except WebSocketDisconnect:
+                raise
             except Exception as e:
                 # Malformed frame or receive error; report and continue
                 try:
-                    await websocket.send_json({"error": str(e)})
+                    await _send(websocket, {"error": str(e)})
                 except Exception:
                     pass
                 continue
@@ -114,9 +231,9 @@ async def ws(websocket: WebSocket):
                     }
                 # One-shot or streaming response
                 if is_json and data.get("stream"):
-                    log.info("ws_stream_start", extra={"message": message[:80]})
+                    log.info("ws_stream_start", extra={"preview": message[:80]})
                     # Inform client streaming has started
-                    await websocket.send_json({"stream": True, "done": False})
+                    await _send(websocket, {"stream": True, "done": False})
 
                     # Minimal cancel support: listen for a {type:"cancel"} control frame while streaming
                     cancel_event = asyncio.Event()
@@ -124,9 +241,9 @@ async def ws(websocket: WebSocket):
                     async def listen_cancel():
                         while True:
                             try:
-                                raw_ctrl = await websocket.receive_text()
+                                raw_ctrl = await _receive(websocket)
                                 try:
-                                    ctrl = json.loads(raw_ctrl)
+                                    ctrl = orjson.loads(raw_ctrl)
                                 except Exception:
                                     continue
                                 if isinstance(ctrl, dict) and ctrl.get("type") == "cancel" and ctrl.get("id") == data.get("id"):
@@ -140,12 +257,14 @@ async def ws(websocket: WebSocket):
 
                     listener_task = asyncio.create_task(listen_cancel())
                     try:
-                        async for delta in stream_agent(message, meta):
-                            if cancel_event.is_set():
-                                log.info("ws_stream_cancel")
-                                break
-                            await websocket.send_json({"delta": delta})
-                        await websocket.send_json({"done": True})
+                        # aclosing() stops the provider stream as soon as we break out on cancel
+                        async with aclosing(_coalesced(stream_agent(message, meta))) as deltas:
+                            async for delta in deltas:
+                                if cancel_event.is_set():
+                                    log.info("ws_stream_cancel")
+                                    break
+                                await _send(websocket, {"delta": delta})
+                        await _send(websocket, {"done": True})
                         log.info("ws_stream_done")
                     finally:
                         if not listener_task.done():
@@ -154,13 +273,13 @@ async def ws(websocket: WebSocket):
                     resp = await call_agent(message, meta)
                     # Send response back to client
                     if is_json:
-                        await websocket.send_json({"response": resp})
+                        await _send(websocket, {"response": resp})
                     else:
                         await websocket.send_text(resp if isinstance(resp, str) else str(resp))
             except Exception as e:
                 # If processing failed, report error
                 try:
-                    await websocket.send_json({"error": str(e)}) if is_json else await websocket.send_text(f"Error: {e}")
+                    await _send(websocket, {"error": str(e)}) if is_json else await websocket.send_text(f"Error: {e}")
                 except Exception:
                     pass
     except WebSocketDisconnect:
@@ -0,0 +1,44 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable
+import os, threading
+import orjson
+
+def by_id(rows: list[dict]) -> dict:
+    """{id: row} index; the first row wins on duplicate ids (stores keep newest rows first)."""
+    idx: dict = {}
+    for r in rows:
+        idx.setdefault(r.get("id"), r)
+    return idx
+
+class JsonStoreCache:
+    """Parsed rows of a JSON list file, reparsed only when the file's (mtime_ns, size, inode) changes.
+
+    Non-dict rows are dropped so hand-edited files can't break callers. `index`, if given,
+    derives extra lookup data from the rows once per parse; `load()` returns (rows, index).
+    Callers must treat both as read-only and copy before mutating.
+    """
+
+    def __init__(self, path: str | os.PathLike, index: Callable[[list[dict]], Any] | None = None):
+        self.path = Path(path)
+        self._index = index
+        self._lock = threading.Lock()
+        self._sig: tuple[int, int, int] | None = None
+        self._value: tuple[list[dict], Any] = ([], index([]) if index else None)
+
+    def load(self) -> tuple[list[dict], Any]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return [], (self._index([]) if self._index else None)
+        sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        with self._lock:
+            if self._sig != sig:
+                try:
+                    data = orjson.loads(self.path.read_bytes())
+                except Exception:
+                    data = []
+                rows = [r for r in data if isinstance(r, dict)] if isinstance(data, list) else []
+                self._value = (rows, self._index(rows) if self._index else None)
+                self._sig = sig
+            return self._value
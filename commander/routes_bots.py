@@ -2,20 +2,28 @@ from __future__ import annotations
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from pathlib import Path
-import json, uuid, time, os
+import uuid, time, os
+import orjson
+from commander.json_store import JsonStoreCache, by_id
 
 router = APIRouter()
 DB_PATH = Path(os.environ.get("QC_BOTS_DB","data/bots.json"))
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 if not DB_PATH.exists(): DB_PATH.write_text("[]", encoding="utf-8")
 
+# Parsed rows plus {id: row}, reparsed only when bots.json changes
+_STORE = JsonStoreCache(DB_PATH, index=by_id)
+
+def _cached():
+    return _STORE.load()
+
 def _load():
-    try: return json.loads(DB_PATH.read_text("utf-8"))
-    except Exception: return []
+    # Shallow copy: callers insert/replace rows before saving
+    return list(_cached()[0])
 
 def _save(bots):
     tmp = DB_PATH.with_suffix(".json.tmp")
-    tmp.write_text(json.dumps(bots, ensure_ascii=False, indent=2), "utf-8")
+    tmp.write_bytes(orjson.dumps(bots, option=orjson.OPT_INDENT_2))
     tmp.replace(DB_PATH)
 
 class BotProfile(BaseModel):
@@ -54,9 +62,9 @@ def create_bot(bot: BotProfile):
 
 @router.get("/bots/{bot_id}")
 def get_bot(bot_id: str):
-    for b in _load():
-        if b["id"] == bot_id:
-            return {"ok": True, "bot": b}
+    b = _cached()[1].get(bot_id)
+    if b is not None:
+        return {"ok": True, "bot": b}
     raise HTTPException(404, "bot not found")
 
 @router.patch("/bots/{bot_id}")
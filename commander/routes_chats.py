@@ -1,8 +1,10 @@
 from __future__ import annotations
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
 from pathlib import Path
-import json, time, os, uuid
+import time, os, uuid
+import orjson
+from commander.json_store import JsonStoreCache, by_id
 
 router = APIRouter()
 DB = Path(os.environ.get("QC_CHATS_DB","data/chats.json"))
@@ -18,32 +20,39 @@ class ChatCreate(BaseModel):
     title: str
     transcript: list[Message]
 
+# Parsed rows plus {id: row}, reparsed only when chats.json changes
+_STORE = JsonStoreCache(DB, index=by_id)
+
+def _cached():
+    return _STORE.load()
+
 def _load():
-    try: return json.loads(DB.read_text("utf-8"))
-    except Exception: return []
+    # Shallow copy: callers insert rows before saving
+    return list(_cached()[0])
 
 def _save(rows):
     tmp = DB.with_suffix(".tmp.json")
-    tmp.write_text(json.dumps(rows, ensure_ascii=False, indent=2), "utf-8")
+    tmp.write_bytes(orjson.dumps(rows, option=orjson.OPT_INDENT_2))
     tmp.replace(DB)
 
 @router.get("/chats")
 def list_chats():
-    return {"ok": True, "chats": _load()}
+    # Encode the whole transcript list in one orjson pass; jsonable_encoder would walk every message in Python
+    return Response(orjson.dumps({"ok": True, "chats": _cached()[0]}), media_type="application/json")
 
 @router.post("/chats")
 def create_chat(c: ChatCreate):
     rows = _load()
     cid = uuid.uuid4().hex
-    row = {"id": cid, "title": c.title, "ts": time.time(), "transcript": [m.model_dump() for m in c.transcript]}
+    row = {"id": cid, "title": c.title, "ts": time.time(), "transcript": c.model_dump()["transcript"]}
     rows.insert(0, row)
     _save(rows)
     return {"ok": True, "chat": row}
 
 @router.get("/chats/{cid}")
 def get_chat(cid: str):
-    for r in _load():
-        if r["id"] == cid:
-            return {"ok": True, "chat": r}
+    r = _cached()[1].get(cid)
+    if r is not None:
+        return {"ok": True, "chat": r}
     raise HTTPException(404, "chat not found")
 
@@ -2,7 +2,9 @@ from __future__ import annotations
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import FileResponse
 from pathlib import Path
-import os, time, uuid, json
+import asyncio, os, time, uuid, threading
+import orjson
+from commander.json_store import JsonStoreCache, by_id
 
 router = APIRouter()
 ROOT = Path(os.environ.get("QC_UPLOAD_DIR","uploads"))
@@ -10,19 +12,30 @@ ROOT.mkdir(parents=True, exist_ok=True)
 
 META = ROOT / "_meta.json"
 
+# Parsed rows plus {id: row}, reparsed only when _meta.json changes
+_STORE = JsonStoreCache(META, index=by_id)
+
+def _cached_meta():
+    return _STORE.load()
+
 def _load_meta():
-    if not META.exists():
-        return []
-    try:
-        return json.loads(META.read_text("utf-8"))
-    except Exception:
-        return []
+    # Shallow copy: upload() inserts a row before saving
+    return list(_cached_meta()[0])
 
 def _save_meta(rows):
     tmp = META.with_suffix('.tmp.json')
-    tmp.write_text(json.dumps(rows, ensure_ascii=False, indent=2), "utf-8")
+    tmp.write_bytes(orjson.dumps(rows, option=orjson.OPT_INDENT_2))
     tmp.replace(META)
 
+_META_WRITE_LOCK = threading.Lock()
+
+def _add_meta(row):
+    # Runs in a worker thread; the lock keeps concurrent uploads from dropping each other's rows
+    with _META_WRITE_LOCK:
+        rows = _load_meta()
+        rows.insert(0, row)
+        _save_meta(rows)
+
 @router.post("/files/upload")
 async def upload(file: UploadFile = File(...)):
     max_size = int(os.environ.get("QC_MAX_UPLOAD","10485760"))
@@ -31,23 +44,28 @@ async def upload(file: UploadFile = File(...)):
     safe_name = Path(file.filename).name
     dest = ROOT / f"{fid}_{safe_name}"
     size = 0
-    with dest.open("wb") as w:
+    # Disk writes go through worker threads so concurrent uploads don't stall the event loop
+    w = await asyncio.to_thread(dest.open, "wb")
+    try:
         while True:
-            chunk = await file.read(1024*1024)
+            # Never read more than one byte past the limit, so an oversized upload is rejected without buffering a full chunk
+            chunk = await file.read(min(1024*1024, max_size - size + 1))
             if not chunk:
                 break
             size += len(chunk)
             if size > max_size:
+                w.close()
                 try:
                     dest.unlink(missing_ok=True)
                 except Exception:
                     pass
                 raise HTTPException(413, "file too large")
-            w.write(chunk)
-    rows = _load_meta()
-    rows.insert(0, {"id": fid, "name": safe_name, "path": dest.name, "size": size, "ts": time.time()})
-    _save_meta(rows)
-    return {"ok": True, "file": rows[0]}
+            await asyncio.to_thread(w.write, chunk)
+    finally:
+        w.close()
+    row = {"id": fid, "name": safe_name, "path": dest.name, "size": size, "ts": time.time()}
+    await asyncio.to_thread(_add_meta, row)
+    return {"ok": True, "file": row}
 
 @router.get("/files")
 def list_files():
@@ -55,8 +73,14 @@ def list_files():
 
 @router.get("/files/{fid}")
 def get_file(fid: str):
-    for row in _load_meta():
-        if row["id"] == fid:
-            return FileResponse((ROOT / row["path"]).as_posix(), filename=row["name"])
+    row = _cached_meta()[1].get(fid)
+    if row is not None:
+        path = ROOT / row["path"]
+        try:
+            st = path.stat()
+        except OSError:
+            raise HTTPException(404, "not found")
+        # Handing over the stat result spares FileResponse a second stat per download
+        return FileResponse(path.as_posix(), filename=row["name"], stat_result=st)
     raise HTTPException(404, "not found")
 
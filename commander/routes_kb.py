@@ -1,8 +1,10 @@
 from __future__ import annotations
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
 from pathlib import Path
-import json, os, time, math
+import heapq, os, time, math
+import orjson
+from commander.json_store import JsonStoreCache
 
 router = APIRouter()
 DB = Path(os.environ.get("QC_KB_DB","data/kb.json"))
@@ -14,13 +16,27 @@ class KBItem(BaseModel):
     source: str
     ts: float
 
+def _terms(rows):
+    # Token sets are built once per parse so searches only intersect sets
+    terms = []
+    for r in rows:
+        toks = frozenset(str(r.get("text", "")).lower().split())
+        terms.append((toks, math.sqrt(len(toks)+1e-6)))
+    return terms
+
+# Parsed rows plus [(tokens, norm)] aligned with them, reparsed only when kb.json changes
+_STORE = JsonStoreCache(DB, index=_terms)
+
+def _cached():
+    return _STORE.load()
+
 def _load():
-    try: return json.loads(DB.read_text("utf-8"))
-    except Exception: return []
+    # Shallow copy: callers insert rows before saving
+    return list(_cached()[0])
 
 def _save(rows):
     tmp = DB.with_suffix(".tmp.json")
-    tmp.write_text(json.dumps(rows, ensure_ascii=False, indent=2), "utf-8")
+    tmp.write_bytes(orjson.dumps(rows, option=orjson.OPT_INDENT_2))
     tmp.replace(DB)
 
 @router.post("/kb/index")
@@ -34,11 +50,12 @@ def kb_index(text: str, source: str = "manual"):
 @router.get("/kb/search")
 def kb_search(q: str, k: int = 5):
     # toy scoring: length-normalized token overlap
-    rows = _load()
-    qs = set(q.lower().split())
-    def score(t):
-        s = set(t.lower().split())
-        return len(qs & s) / math.sqrt(len(s)+1e-6)
-    ranked = sorted(rows, key=lambda r: score(r["text"]), reverse=True)[:max(1,min(k,20))]
-    return {"ok": True, "hits": ranked}
+    rows, terms = _cached()
+    qs = frozenset(q.lower().split())
+    def score(i):
+        toks, norm = terms[i]
+        return len(qs & toks) / norm
+    # nlargest is documented to match sorted(..., reverse=True)[:k], ties included, without sorting every row
+    ranked = [rows[i] for i in heapq.nlargest(max(1,min(k,20)), range(len(rows)), key=score)]
+    return Response(orjson.dumps({"ok": True, "hits": ranked}), media_type="application/json")
 
@@ -1,12 +1,39 @@
 from __future__ import annotations
 from fastapi import APIRouter, Request
 from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from commander.agent import stream_agent, make_agent as call_agent, apply_bot_overrides
 import asyncio, json, time, uuid, logging
 
 router = APIRouter()
 log = logging.getLogger("qc")
 
+class ChatRequest(BaseModel):
+    message: str
+    provider: str | None = None
+    model: str | None = None
+    temperature: float | None = None
+    max_tokens: int | None = None
+    timeout_s: float | None = None
+    system_prompt: str | None = None
+    bot_id: str = ""
+
+@router.post("/chat")
+async def chat(req: ChatRequest):
+    """One-shot reply over plain HTTP; /ws and /sse remain the streaming transports."""
+    payload = req.model_dump(exclude_none=True)
+    try:
+        payload = apply_bot_overrides(payload)
+    except Exception:
+        pass
+    meta = {k: payload.get(k) for k in ("provider", "model", "temperature", "max_tokens", "timeout_s", "system_prompt")}
+    try:
+        resp = await call_agent(req.message, meta)
+    except Exception as e:
+        # Same surface as /ws: report setup errors (unknown provider, missing key) instead of a 500
+        return {"ok": False, "error": str(e)}
+    return {"ok": True, "response": resp}
+
 @router.get("/sse")
 async def sse(
     request: Request,
@@ -14,6 +14,7 @@ if str(REPO_ROOT) not in sys.path:
 def _clear_modules():
     for name in [
         "commander.commander",
+        "commander.routes_bots",
         "commander.routes_files",
         "commander.routes_kb",
         "commander.routes_chats",
@@ -41,7 +42,7 @@ def app_client(tmp_path, monkeypatch):
     monkeypatch.setenv("MODEL_PROVIDER", "openai")
 
     _clear_modules()
-    from commander import commander as commander_mod  # type: ignore
+    commander_mod = importlib.import_module("commander.commander")
 
     app = commander_mod.app
     client = TestClient(app)
@@ -0,0 +1,252 @@
+import asyncio
+import itertools
+
+
+def _fake_make_agent(delay: float = 0.0):
+    async def fake(message: str, meta=None):
+        await asyncio.sleep(delay)
+        return f"ok:{message}:{meta['model']}"
+    return fake
+
+
+def test_run_once_sync_context(monkeypatch):
+    from commander import agent
+
+    monkeypatch.setattr(agent, "make_agent", _fake_make_agent(), raising=True)
+    out = agent.run_once(provider="openai", model="m", message="hi", temperature=0.1, max_tokens=5)
+    assert out == "ok:hi:m"
+
+
+def test_run_once_inside_running_loop(monkeypatch):
+    from commander import agent
+
+    monkeypatch.setattr(agent, "make_agent", _fake_make_agent(0.01), raising=True)
+
+    async def caller():
+        return agent.run_once(provider="openai", model="m", message="nested", temperature=0.1, max_tokens=5)
+
+    assert asyncio.run(caller()) == "ok:nested:m"
+
+
+def test_run_once_from_sync_loop_does_not_deadlock(monkeypatch):
+    from commander import agent
+
+    monkeypatch.setattr(agent, "make_agent", _fake_make_agent(), raising=True)
+
+    async def caller():
+        return agent.run_once(provider="openai", model="m", message="inner", temperature=0.1, max_tokens=5)
+
+    loop = agent._sync_loop()
+    # Force round-robin to hand the nested call back to the caller's own loop
+    monkeypatch.setattr(agent, "_sync_loop_rr", itertools.repeat(agent._SYNC_LOOPS.index(loop)))
+    fut = asyncio.run_coroutine_threadsafe(caller(), loop)
+    assert fut.result(timeout=5) == "ok:inner:m"
+
+
+class _FakeSdkClient:
+    def __init__(self, timeout=None, **kwargs):
+        self.timeout = timeout
+
+    def with_options(self, timeout=None):
+        return _FakeSdkClient(timeout=timeout)
+
+
+def test_lazy_client_cache_ignores_per_call_timeout(monkeypatch):
+    import types
+    from commander import agent
+
+    monkeypatch.setattr(agent, "_groq", types.SimpleNamespace(Groq=_FakeSdkClient, AsyncGroq=_FakeSdkClient))
+    monkeypatch.setattr(agent, "_CLIENTS", {})
+
+    _, base = agent._lazy_client("groq")
+    assert agent._lazy_client("groq")[1] is base
+    for t in (1.5, 2.5, 3.5):
+        _, c = agent._lazy_client("groq", timeout_s=t)
+        assert c.timeout == t
+    assert list(agent._CLIENTS) == [("groq", False)]
+
+
+def test_shared_pools_match_sdk_client_defaults(monkeypatch):
+    from commander import agent
+
+    monkeypatch.setattr(agent, "_HTTPX_CLIENTS", {})
+    pool = agent._http_client("openai")
+    try:
+        assert pool.follow_redirects is True
+    finally:
+        pool.close()
+
+
+def test_aclose_http_clients_drops_async_pools(monkeypatch):
+    from commander import agent
+
+    monkeypatch.setattr(agent, "_HTTPX_CLIENTS", {})
+    monkeypatch.setattr(agent, "_CLIENTS", {("groq", True): ("groq", object()), ("groq", False): ("groq", object())})
+
+    async def scenario():
+        pool = agent._http_client("groq", True)
+        await agent.aclose_http_clients()
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert pool.is_closed
+    assert agent._HTTPX_CLIENTS == {}
+    assert list(agent._CLIENTS) == [("groq", False)]
+
+
+def test_prewarm_skips_providers_without_key(monkeypatch):
+    import types
+    from commander import agent
+
+    settings = dict(agent.S, OPENAI_API_KEY="sk-test", GROQ_API_KEY=None)
+    monkeypatch.setattr(agent, "S", settings)
+    heads = []
+
+    class FakePool:
+        async def head(self, url):
+            heads.append(url)
+
+    monkeypatch.setattr(agent, "_lazy_async_client", lambda p: (p, types.SimpleNamespace(base_url=f"https://{p}.test/")))
+    monkeypatch.setattr(agent, "_http_client", lambda p, want_async=False: FakePool())
+
+    asyncio.run(agent.prewarm_clients(["openai", "groq", "OpenAI", "unknown", None]))
+    assert heads == ["https://openai.test/"]
+
+
+def test_configured_providers_include_bots(tmp_path, monkeypatch):
+    import json
+    from commander import agent
+
+    db = tmp_path / "bots.json"
+    db.write_text(json.dumps([{"id": "a", "provider": "Groq"}, {"id": "b", "provider": "openai"}, {"id": "c", "provider": 7}]), "utf-8")
+    monkeypatch.setenv("QC_BOTS_DB", str(db))
+    monkeypatch.setattr(agent, "S", dict(agent.S, MODEL_PROVIDER="openai"))
+    assert agent.configured_providers() == ["openai", "groq"]
+
+
+class _AsyncIter:
+    def __init__(self, items):
+        self._items = list(items)
+
+    def __aiter__(self):
+        return self._gen()
+
+    async def _gen(self):
+        for item in self._items:
+            yield item
+
+
+def _chat_chunk(text):
+    import types
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=text))])
+
+
+def _collect(agent, meta):
+    async def run():
+        return [d async for d in agent.stream_agent("hi", meta)]
+    return asyncio.run(run())
+
+
+def test_stream_agent_chat_deltas(monkeypatch):
+    import types
+    from commander import agent
+
+    seen = {}
+
+    async def create(**kwargs):
+        seen.update(kwargs)
+        return _AsyncIter([_chat_chunk("hel"), _chat_chunk(None), _chat_chunk("lo")])
+
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+    monkeypatch.setattr(agent, "_lazy_async_client", lambda provider_override=None, timeout_s=None: ("groq", client))
+
+    assert _collect(agent, {"provider": "groq", "model": "llama"}) == ["hel", "lo"]
+    assert seen["stream"] is True and seen["messages"][0]["role"] == "system"
+
+
+def test_stream_agent_reports_errors(monkeypatch):
+    import types
+    from commander import agent
+
+    async def create(**kwargs):
+        raise RuntimeError("boom")
+
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+    monkeypatch.setattr(agent, "_lazy_async_client", lambda provider_override=None, timeout_s=None: ("groq", client))
+
+    assert _collect(agent, {"provider": "groq", "model": "llama"}) == ["[agent-error] RuntimeError: boom"]
+
+
+def test_make_agent_does_not_block_event_loop(monkeypatch):
+    import time
+    import types
+    from commander import agent
+
+    def create(**kwargs):
+        time.sleep(0.2)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=" pong "))])
+
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+    monkeypatch.setattr(agent, "_lazy_client", lambda provider_override=None, timeout_s=None: ("groq", client))
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        t = asyncio.create_task(ticker())
+        resp = await agent.make_agent("ping", {"provider": "groq", "model": "llama"})
+        t.cancel()
+        return resp, ticks
+
+    resp, ticks = asyncio.run(run())
+    assert resp == "pong"
+    assert ticks >= 5
+
+
+def test_stream_agent_anthropic_text_stream(monkeypatch):
+    import types
+    from commander import agent
+
+    class Manager:
+        async def __aenter__(self):
+            return types.SimpleNamespace(text_stream=_AsyncIter(["a", "", "b"]))
+
+        async def __aexit__(self, *exc):
+            return False
+
+    client = types.SimpleNamespace(messages=types.SimpleNamespace(stream=lambda **kwargs: Manager()))
+    monkeypatch.setattr(agent, "_lazy_async_client", lambda provider_override=None, timeout_s=None: ("anthropic", client))
+
+    assert _collect(agent, {"provider": "anthropic", "model": "claude"}) == ["a", "b"]
+
+
+def test_import_does_not_load_provider_sdks(tmp_path):
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    repo = Path(__file__).resolve().parents[1]
+    code = (
+        "import sys, commander.commander; "
+        "print(','.join(m for m in ('openai', 'anthropic', 'groq', 'supabase') if m in sys.modules))"
+    )
+    env = {"PYTHONPATH": str(repo), "PATH": "", "QC_UPLOAD_DIR": str(tmp_path / "uploads"),
+           "QC_BOTS_DB": str(tmp_path / "bots.json"), "QC_KB_DB": str(tmp_path / "kb.json"),
+           "QC_CHATS_DB": str(tmp_path / "chats.json")}
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == ""
+
+
+def test_openai_o_family_match():
+    from commander.agent import _openai_use_responses
+
+    for m in ("o1", "o3", "o4-mini", "O3-pro", "gpt-5-mini", "gpt-4o", "gpt-4.1-nano"):
+        assert _openai_use_responses(m), m
+    for m in ("opus-on-openai", "o2", "omni", "gpt-3.5-turbo", ""):
+        assert not _openai_use_responses(m), m
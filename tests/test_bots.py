@@ -25,3 +25,39 @@ def test_bots_crud(app_client):
 
     r_del = app_client.delete(f"/bots/{bot['id']}")
     assert r_del.status_code == 200
+
+
+def test_bot_overrides_follow_db_updates(app_client):
+    from commander.agent import apply_bot_overrides
+
+    r = app_client.post("/bots", json={"name": "Override Bot", "model": "gpt-4o", "system_prompt": "Be terse."})
+    bot_id = r.json()["bot"]["id"]
+
+    payload = apply_bot_overrides({"message": "hi", "bot_id": bot_id})
+    assert payload["model"] == "gpt-4o"
+    assert payload["system_prompt"] == "Be terse."
+
+    app_client.patch(f"/bots/{bot_id}", json={"model": "gpt-4.1-mini"})
+    payload = apply_bot_overrides({"message": "hi", "bot_id": bot_id})
+    assert payload["model"] == "gpt-4.1-mini"
+
+
+def test_bot_overrides_prefer_first_duplicate(tmp_path, monkeypatch):
+    import json
+    from commander.agent import apply_bot_overrides
+
+    db = tmp_path / "bots.json"
+    db.write_text(json.dumps([{"id": "dup", "model": "newest"}, {"id": "dup", "model": "oldest"}]), "utf-8")
+    monkeypatch.setenv("QC_BOTS_DB", str(db))
+    assert apply_bot_overrides({"bot_id": "dup"})["model"] == "newest"
+
+
+def test_list_bots_skips_non_dict_rows(app_client):
+    import json
+    import os
+
+    with open(os.environ["QC_BOTS_DB"], "w", encoding="utf-8") as f:
+        json.dump([{"id": "ok", "name": "Kept"}, "stray", 42], f)
+    r = app_client.get("/bots")
+    assert r.status_code == 200
+    assert [b["id"] for b in r.json()["bots"]] == ["ok"]
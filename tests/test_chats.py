@@ -0,0 +1,15 @@
+def test_chats_create_list_get(app_client):
+    payload = {"title": "Greeting", "transcript": [{"role": "user", "text": "héllo"}, {"role": "assistant", "text": "hi", "ts": 1.0}]}
+    r = app_client.post("/chats", json=payload)
+    assert r.status_code == 200
+    chat = r.json()["chat"]
+    assert chat["transcript"][0] == {"role": "user", "text": "héllo", "ts": None}
+
+    r_list = app_client.get("/chats")
+    assert r_list.status_code == 200
+    assert r_list.headers["content-type"] == "application/json"
+    assert r_list.json()["chats"][0]["id"] == chat["id"]
+
+    r_get = app_client.get(f"/chats/{chat['id']}")
+    assert r_get.status_code == 200 and r_get.json()["chat"]["title"] == "Greeting"
+    assert app_client.get("/chats/missing").status_code == 404
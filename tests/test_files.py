@@ -13,3 +13,26 @@ def test_files_upload_and_list(app_client):
     assert r2.status_code == 200
     j2 = r2.json()
     assert any(f["id"] == file_id for f in j2.get("files", []))
+
+    r3 = app_client.get(f"/files/{file_id}")
+    assert r3.status_code == 200 and r3.content == content
+    assert app_client.get("/files/missing").status_code == 404
+
+
+def test_files_upload_too_large(app_client, monkeypatch):
+    import os
+
+    monkeypatch.setenv("QC_MAX_UPLOAD", "4")
+    r = app_client.post("/files/upload", files={"file": ("big.bin", io.BytesIO(b"0123456789"), "application/octet-stream")})
+    assert r.status_code == 413
+    assert not [n for n in os.listdir(os.environ["QC_UPLOAD_DIR"]) if n.endswith("_big.bin")]
+    assert app_client.get("/files").json()["files"] == []
+
+
+def test_files_get_missing_blob_is_404(app_client):
+    import os
+
+    r = app_client.post("/files/upload", files={"file": ("gone.txt", io.BytesIO(b"x"), "text/plain")})
+    row = r.json()["file"]
+    os.remove(os.path.join(os.environ["QC_UPLOAD_DIR"], row["path"]))
+    assert app_client.get(f"/files/{row['id']}").status_code == 404
@@ -5,3 +5,39 @@ def test_health_ok(app_client):
     assert j.get("ok") is True
     assert "provider" in j and "available_models" in j
     assert j.get("ws") is True and j.get("sse") is True
+
+
+def test_health_deepseek_catalog(monkeypatch):
+    import importlib
+    import sys
+
+    monkeypatch.setenv("MODEL_PROVIDER", "deepseek")
+    for name in ("app.main", "app.settings"):
+        sys.modules.pop(name, None)
+    main = importlib.import_module("app.main")
+    j = main._health_payload()
+    assert j["model"] == "deepseek-chat"
+    assert "deepseek" in j["available_providers"]
+    assert j["available_models"] == main._MODEL_CATALOG["deepseek"]
+    for name in ("app.main", "app.settings"):
+        sys.modules.pop(name, None)
+
+
+def test_index_served_from_cache(app_client):
+    r1 = app_client.get("/")
+    assert r1.status_code == 200
+    assert r1.headers["content-type"].startswith("text/html")
+    assert "<title>Quantum Commander</title>" in r1.text
+    assert app_client.get("/").content == r1.content
+
+
+def test_startup_survives_prewarm_failure(app_client, monkeypatch):
+    from starlette.testclient import TestClient
+    from commander import commander as cm
+
+    def broken():
+        raise TypeError("bad bots.json")
+
+    monkeypatch.setattr(cm, "configured_providers", broken)
+    with TestClient(cm.app) as client:
+        assert client.get("/health").status_code == 200
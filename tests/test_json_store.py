@@ -0,0 +1,35 @@
+import json
+
+
+def test_store_skips_non_dict_rows_and_indexes_first_duplicate(tmp_path):
+    from commander.json_store import JsonStoreCache, by_id
+
+    db = tmp_path / "rows.json"
+    db.write_text(json.dumps([{"id": "a", "v": 1}, "junk", 3, None, {"id": "a", "v": 2}]), "utf-8")
+    rows, idx = JsonStoreCache(db, index=by_id).load()
+    assert rows == [{"id": "a", "v": 1}, {"id": "a", "v": 2}]
+    assert idx["a"]["v"] == 1
+
+
+def test_store_reloads_only_when_file_changes(tmp_path):
+    from commander.json_store import JsonStoreCache
+
+    db = tmp_path / "rows.json"
+    db.write_text(json.dumps([{"id": "a"}]), "utf-8")
+    store = JsonStoreCache(db)
+    first, _ = store.load()
+    assert store.load()[0] is first
+
+    tmp = tmp_path / "rows.tmp.json"
+    tmp.write_text(json.dumps([{"id": "b"}, {"id": "c"}]), "utf-8")
+    tmp.replace(db)
+    assert [r["id"] for r in store.load()[0]] == ["b", "c"]
+
+
+def test_store_missing_or_malformed_file(tmp_path):
+    from commander.json_store import JsonStoreCache, by_id
+
+    assert JsonStoreCache(tmp_path / "absent.json", index=by_id).load() == ([], {})
+    bad = tmp_path / "bad.json"
+    bad.write_text('{"not": "a list"}', "utf-8")
+    assert JsonStoreCache(bad).load() == ([], None)
@@ -5,3 +5,24 @@ def test_kb_index_and_search(app_client):
     assert r2.status_code == 200
     hits = r2.json().get("hits", [])
     assert any("quantum" in h.get("text", "").lower() for h in hits)
+
+
+def test_kb_search_sees_external_db_edits(app_client):
+    import json
+    import os
+
+    app_client.post("/kb/index", params={"text": "first entry", "source": "test"})
+    assert app_client.get("/kb/search", params={"q": "first"}).json()["hits"][0]["text"] == "first entry"
+
+    db = os.environ["QC_KB_DB"]
+    with open(db, "w", encoding="utf-8") as f:
+        json.dump([{"id": "kb_ext", "text": "edited outside the app", "source": "ext", "ts": 0}], f)
+    hits = app_client.get("/kb/search", params={"q": "outside"}).json()["hits"]
+    assert [h["id"] for h in hits] == ["kb_ext"]
+
+
+def test_kb_search_ranks_by_overlap(app_client):
+    for text in ("alpha beta", "alpha beta gamma delta epsilon", "unrelated words"):
+        app_client.post("/kb/index", params={"text": text, "source": "test"})
+    hits = app_client.get("/kb/search", params={"q": "Alpha BETA", "k": 2}).json()["hits"]
+    assert [h["text"] for h in hits] == ["alpha beta", "alpha beta gamma delta epsilon"]
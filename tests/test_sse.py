@@ -23,3 +23,42 @@ def test_sse_stream_with_stub(app_client, monkeypatch):
         assert re.search(r"data: \{.*\}$", body, re.M)
         assert "hello " in body and "world" in body
         assert re.search(r"^event: done$", body, re.M)
+
+
+def test_chat_one_shot(app_client, monkeypatch):
+    seen = {}
+
+    async def fake_call_agent(message: str, meta=None):
+        seen.update(meta or {})
+        return "ok:" + message
+
+    from commander import routes_sse as r
+    monkeypatch.setattr(r, "call_agent", fake_call_agent, raising=True)
+
+    resp = app_client.post("/chat", json={"message": "ping", "model": "gpt-4o"})
+    assert resp.status_code == 200
+    assert resp.json() == {"ok": True, "response": "ok:ping"}
+    assert seen["model"] == "gpt-4o" and seen["temperature"] is None
+
+
+def test_chat_applies_bot_overrides(app_client, monkeypatch):
+    seen = {}
+
+    async def fake_call_agent(message: str, meta=None):
+        seen.update(meta or {})
+        return "ok"
+
+    from commander import routes_sse as r
+    monkeypatch.setattr(r, "call_agent", fake_call_agent, raising=True)
+
+    bot = app_client.post("/bots", json={"name": "Chat Bot", "model": "gpt-4o", "system_prompt": "Be terse."}).json()["bot"]
+    resp = app_client.post("/chat", json={"message": "ping", "bot_id": bot["id"]})
+    assert resp.status_code == 200
+    assert seen["model"] == "gpt-4o" and seen["system_prompt"] == "Be terse."
+
+
+def test_chat_unknown_provider_reports_error(app_client):
+    resp = app_client.post("/chat", json={"message": "hi", "provider": "nope"})
+    assert resp.status_code == 200
+    j = resp.json()
+    assert j["ok"] is False and "nope" in j["error"]
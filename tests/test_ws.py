@@ -45,3 +45,92 @@ def test_ws_nonstream_ok(app_client, monkeypatch):
         ws.send_json({"message": "ping", "stream": False})
         msg = ws.receive_json()
         assert msg.get("response") == "ok:ping"
+
+
+def test_ws_accepts_binary_frames(app_client, monkeypatch):
+    from commander import commander as cm
+
+    async def fake_call_agent(message: str, meta=None):
+        return "ok:" + message
+
+    monkeypatch.setattr(cm, "call_agent", fake_call_agent, raising=True)
+
+    with app_client.websocket_connect("/ws") as ws:
+        ws.send_bytes(b'{"message": "bin", "stream": false}')
+        assert ws.receive_json().get("response") == "ok:bin"
+        ws.send_bytes("plain caf\u00e9".encode())
+        assert ws.receive_text() == "ok:plain caf\u00e9"
+
+
+def test_ws_stream_completes_with_done(app_client, monkeypatch):
+    from commander import commander as cm
+
+    async def fake_stream_agent(message: str, meta=None):
+        for i in range(5):
+            await asyncio.sleep(0.01)
+            yield f"c{i} "
+
+    monkeypatch.setattr(cm, "stream_agent", fake_stream_agent, raising=True)
+
+    with app_client.websocket_connect("/ws") as ws:
+        ws.send_json({"id": "t2", "message": "hello", "stream": True})
+        assert ws.receive_json().get("stream") is True
+        text = ""
+        while True:
+            msg = ws.receive_json()
+            if msg.get("done") is True:
+                break
+            text += msg["delta"]
+        assert text == "c0 c1 c2 c3 c4 "
+
+
+def test_ws_stream_with_info_logging(app_client, monkeypatch, caplog):
+    import logging
+    from commander import commander as cm
+
+    async def fake_stream_agent(message: str, meta=None):
+        yield "hi"
+
+    monkeypatch.setattr(cm, "stream_agent", fake_stream_agent, raising=True)
+    caplog.set_level(logging.INFO, logger="qc")
+
+    with app_client.websocket_connect("/ws") as ws:
+        ws.send_json({"message": "hello", "stream": True})
+        assert ws.receive_json().get("stream") is True
+        assert ws.receive_json() == {"delta": "hi"}
+        assert ws.receive_json() == {"done": True}
+
+
+def _drain_coalesced(gen, **kwargs):
+    from commander.commander import _coalesced
+
+    async def run():
+        return [chunk async for chunk in _coalesced(gen, **kwargs)]
+    return asyncio.run(run())
+
+
+def test_coalesced_batches_fast_producer_and_passes_first_delta_alone(app_client):
+    deltas = ["first"] + [f"d{i}" for i in range(50)]
+
+    async def producer():
+        for d in deltas:
+            yield d
+            await asyncio.sleep(0)
+
+    out = _drain_coalesced(producer(), max_chars=10_000, max_delay=0.05)
+    assert out[0] == "first"
+    assert len(out[0]) == len(deltas[0])
+    assert len(out) < len(deltas)
+    assert "".join(out) == "".join(deltas)
+
+
+def test_coalesced_reraises_producer_errors(app_client):
+    import pytest
+
+    async def producer():
+        yield "a"
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        _drain_coalesced(producer())